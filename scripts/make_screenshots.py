@@ -12,18 +12,20 @@ from __future__ import annotations
 import argparse
 import html
 import fcntl
+import functools
 import os
 import pty
-import select
+import re
+import selectors
 import shlex
 import signal
 import struct
 import subprocess
 import termios
 import time
-from dataclasses import dataclass
+from itertools import groupby
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
 
 # Palette approximating xterm defaults.
 BASE_COLORS = [
@@ -46,29 +48,39 @@ BASE_COLORS = [
 ]
 
 
+# Full xterm 256-color table: the base 16, the 6x6x6 cube, then 24 grays.
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+XTERM_COLORS: List[Tuple[int, int, int]] = (
+    BASE_COLORS
+    + [(CUBE_LEVELS[r], CUBE_LEVELS[g], CUBE_LEVELS[b]) for r in range(6) for g in range(6) for b in range(6)]
+    + [(v, v, v) for v in range(8, 248, 10)]
+)
+
+
 def color_from_index(idx: int) -> Tuple[int, int, int]:
-    if idx < 0:
-        return BASE_COLORS[7]
-    if idx < 16:
-        return BASE_COLORS[idx]
-    if idx < 232:
-        v = idx - 16
-        r = (v // 36) % 6
-        g = (v // 6) % 6
-        b = v % 6
-        def level(x: int) -> int:
-            return 55 + x * 40 if x else 0
-        return (level(r), level(g), level(b))
-    v = 8 + (idx - 232) * 10
-    v = max(0, min(255, v))
-    return (v, v, v)
-
-
-@dataclass
-class Cell:
+    return XTERM_COLORS[idx] if 0 <= idx < 256 else BASE_COLORS[7]
+
+
+Color = Tuple[int, int, int]
+T = TypeVar("T")
+
+DEFAULT_FG: Color = (230, 230, 230)
+DEFAULT_BG: Color = (10, 12, 16)
+
+# Characters written to the grid: printable ASCII plus everything from NBSP up.
+PRINTABLE_RE = re.compile(r"[\x20-\x7e\xa0-\U0010ffff]+")
+
+# Parser states for TerminalEmulator.feed.
+STATE_NORMAL = 0
+STATE_ESC = 1
+STATE_CSI = 2
+STATE_OSC = 3
+
+
+class Cell(NamedTuple):
     ch: str = " "
-    fg: Tuple[int, int, int] = (230, 230, 230)
-    bg: Tuple[int, int, int] = (10, 12, 16)
+    fg: Color = DEFAULT_FG
+    bg: Color = DEFAULT_BG
     bold: bool = False
 
 
@@ -76,32 +88,85 @@ class TerminalEmulator:
     def __init__(self, cols: int, rows: int):
         self.cols = cols
         self.rows = rows
+        # The grid is kept as one plane per attribute (structure of arrays), one
+        # list per row, so spans are written with slice stores and color tuples
+        # are shared references instead of per-cell objects.
+        self.ch: List[List[str]] = [[" "] * cols for _ in range(rows)]
+        self.fg: List[List[Color]] = [[DEFAULT_FG] * cols for _ in range(rows)]
+        self.bg: List[List[Color]] = [[DEFAULT_BG] * cols for _ in range(rows)]
+        self.bold: List[bytearray] = [bytearray(cols) for _ in range(rows)]
         self.reset()
 
     def reset(self) -> None:
-        self.cells: List[List[Cell]] = [
-            [Cell() for _ in range(self.cols)] for _ in range(self.rows)
-        ]
+        # Clears the planes in place; resetting (including CSI 2J) reuses the
+        # existing rows instead of allocating a new grid.
+        self.fill_block(0, self.rows, 0, self.cols, " ", DEFAULT_FG, DEFAULT_BG, False)
         self.cx = 0
         self.cy = 0
         self.saved: Optional[Tuple[int, int]] = None
-        self.current_fg = (230, 230, 230)
-        self.current_bg = (10, 12, 16)
-        self.bold = False
+        self.current_fg = DEFAULT_FG
+        self.current_bg = DEFAULT_BG
+        self.current_bold = False
         self.inverse = False
-        self.state = "normal"
-        self.csi_buf = ""
+        self.state = STATE_NORMAL
+        # CSI parameters are parsed as they arrive: finished values go to
+        # csi_params, csi_cur holds the one in progress (None while empty,
+        # -1 once it contains a non-digit, which reads as 0). A "?" marks the
+        # sequence private only as the first byte, so csi_started records
+        # whether any parameter byte has been consumed yet.
+        self.csi_params: List[int] = []
+        self.csi_cur: Optional[int] = None
+        self.csi_private = False
+        self.csi_started = False
         self.osc_active = False
 
+    @property
+    def cells(self) -> List[List[Cell]]:
+        return [
+            [Cell(ch, fg, bg, bool(bold)) for ch, fg, bg, bold in zip(*planes)]
+            for planes in zip(self.ch, self.fg, self.bg, self.bold)
+        ]
+
+    def fill_block(self, top: int, bottom: int, start: int, end: int, ch: str, fg: Color, bg: Color, bold: bool) -> None:
+        # One span per plane is built for the whole block and copied into each
+        # row, so a tall fill costs four slice stores per row and no new lists.
+        n = end - start
+        if n <= 0:
+            return
+        chs, fgs, bgs = [ch] * n, [fg] * n, [bg] * n
+        flags = (b"\x01" if bold else b"\x00") * n
+        for y in range(top, bottom):
+            self.ch[y][start:end] = chs
+            self.fg[y][start:end] = fgs
+            self.bg[y][start:end] = bgs
+            self.bold[y][start:end] = flags
+
     def feed(self, data: bytes) -> None:
+        # Parser state lives in locals for the duration of the loop and is
+        # written back once at the end; attribute lookups per character are
+        # the dominant cost of this state machine in CPython.
         text = data.decode("utf-8", errors="replace")
+        n = len(text)
+        state = self.state
+        csi_params = self.csi_params
+        csi_cur = self.csi_cur
+        csi_private = self.csi_private
+        csi_started = self.csi_started
+        match_printable = PRINTABLE_RE.match
         i = 0
-        while i < len(text):
+        while i < n:
+            if state == STATE_NORMAL:
+                # Printable text arrives in long runs; write each run as a
+                # slice instead of dispatching every character.
+                run = match_printable(text, i)
+                if run:
+                    self._put_text(run.group())
+                    i = run.end()
+                    continue
             ch = text[i]
-            code = ord(ch)
-            if self.state == "normal":
+            if state == STATE_NORMAL:
                 if ch == "\x1b":  # ESC
-                    self.state = "esc"
+                    state = STATE_ESC
                 elif ch == "\r":  # CR
                     self.cx = 0
                 elif ch == "\n":  # LF
@@ -110,37 +175,52 @@ class TerminalEmulator:
                     self.cx = max(0, self.cx - 1)
                 elif ch == "\t":  # TAB
                     self.cx = min(self.cols - 1, ((self.cx // 8) + 1) * 8)
-                elif ch == "\x07":  # BEL
-                    pass
-                elif 0x20 <= code <= 0x7E or code >= 0xA0:
-                    self._put_char(ch)
-                i += 1
-            elif self.state == "esc":
+            elif state == STATE_CSI:
+                if "0" <= ch <= "9":
+                    if csi_cur is None:
+                        csi_cur = ord(ch) - 48
+                    elif csi_cur >= 0:
+                        csi_cur = csi_cur * 10 + ord(ch) - 48
+                elif ch == ";":
+                    if csi_cur is not None:
+                        csi_params.append(max(csi_cur, 0))
+                        csi_cur = None
+                elif "@" <= ch <= "~":
+                    if csi_cur is not None:
+                        csi_params.append(max(csi_cur, 0))
+                    self._handle_csi(ch, csi_params, csi_private)
+                    state = STATE_NORMAL
+                elif ch == "?" and not csi_started:
+                    csi_private = True
+                else:
+                    csi_cur = -1
+                csi_started = True
+            elif state == STATE_ESC:
                 if ch == "[":
-                    self.state = "csi"
-                    self.csi_buf = ""
+                    state = STATE_CSI
+                    csi_params = []
+                    csi_cur = None
+                    csi_private = False
+                    csi_started = False
                 elif ch == "]":
                     self.osc_active = True
-                    self.state = "osc"
+                    state = STATE_OSC
                 else:
-                    self.state = "normal"
-                i += 1
-            elif self.state == "osc":
+                    state = STATE_NORMAL
+            else:  # STATE_OSC
                 if ch == "\x07":  # BEL terminates OSC
                     self.osc_active = False
-                    self.state = "normal"
-                elif ch == "\x1b" and i + 1 < len(text) and text[i + 1] == "\\":
+                    state = STATE_NORMAL
+                elif ch == "\x1b" and i + 1 < n and text[i + 1] == "\\":
                     self.osc_active = False
-                    self.state = "normal"
+                    state = STATE_NORMAL
                     i += 1
-                i += 1
-            elif self.state == "csi":
-                if "@" <= ch <= "~":
-                    self._handle_csi(ch, self.csi_buf)
-                    self.state = "normal"
-                else:
-                    self.csi_buf += ch
-                i += 1
+            i += 1
+        self.state = state
+        self.csi_params = csi_params
+        self.csi_cur = csi_cur
+        self.csi_private = csi_private
+        self.csi_started = csi_started
 
     def _newline(self) -> None:
         self.cx = 0
@@ -150,34 +230,49 @@ class TerminalEmulator:
             self._scroll(1)
 
     def _scroll(self, count: int) -> None:
+        count = min(count, self.rows)
+        if count <= 0:
+            return
         fg, bg = self._effective_colors()
-        for _ in range(count):
-            self.cells.pop(0)
-            self.cells.append([Cell(fg=fg, bg=bg, bold=self.bold) for _ in range(self.cols)])
-
-    def _put_char(self, ch: str) -> None:
+        bold = b"\x01" if self.current_bold else b"\x00"
+        cols = self.cols
+        # Drop the top rows of every plane in one slice delete, then append
+        # blank rows in the current attributes.
+        del self.ch[:count], self.fg[:count], self.bg[:count], self.bold[:count]
+        self.ch.extend([" "] * cols for _ in range(count))
+        self.fg.extend([fg] * cols for _ in range(count))
+        self.bg.extend([bg] * cols for _ in range(count))
+        self.bold.extend(bytearray(bold * cols) for _ in range(count))
+
+    def _put_text(self, text: str) -> None:
+        if self.cols <= 0:
+            return
         fg, bg = self._effective_colors()
-        if self.cx >= self.cols:
-            self._newline()
-        if self.cy >= self.rows:
-            self._scroll(1)
-            self.cy = self.rows - 1
-        self.cells[self.cy][self.cx] = Cell(ch=ch, fg=fg, bg=bg, bold=self.bold)
-        self.cx += 1
-
-    def _effective_colors(self) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+        bold = b"\x01" if self.current_bold else b"\x00"
+        i = 0
+        while i < len(text):
+            if self.cx >= self.cols:
+                self._newline()
+            if self.cy >= self.rows:
+                self._scroll(1)
+                self.cy = self.rows - 1
+            y, start = self.cy, self.cx
+            n = min(self.cols - start, len(text) - i)
+            end = start + n
+            self.ch[y][start:end] = text[i : i + n]
+            self.fg[y][start:end] = [fg] * n
+            self.bg[y][start:end] = [bg] * n
+            self.bold[y][start:end] = bold * n
+            self.cx = end
+            i += n
+
+    def _effective_colors(self) -> Tuple[Color, Color]:
         fg, bg = self.current_fg, self.current_bg
         if self.inverse:
             fg, bg = bg, fg
         return fg, bg
 
-    def _handle_csi(self, final: str, params_raw: str) -> None:
-        private = params_raw.startswith("?")
-        if private:
-            params_raw = params_raw[1:]
-        params = [p for p in params_raw.split(";") if p]
-        ints = [int(p) if p.isdigit() else 0 for p in params] if params else []
-
+    def _handle_csi(self, final: str, ints: List[int], private: bool) -> None:
         if final in ("H", "f"):
             row = ints[0] if len(ints) >= 1 else 1
             col = ints[1] if len(ints) >= 2 else 1
@@ -205,9 +300,8 @@ class TerminalEmulator:
                 else:
                     start, end = 0, self.cols
                 fg, bg = self._effective_colors()
-                for x in range(start, min(end, self.cols)):
-                    if 0 <= self.cy < self.rows:
-                        self.cells[self.cy][x] = Cell(fg=fg, bg=bg, bold=self.bold)
+                if 0 <= self.cy < self.rows:
+                    self.fill_block(self.cy, self.cy + 1, start, min(end, self.cols), " ", fg, bg, self.current_bold)
         elif final == "m":
             self._apply_sgr(ints)
         elif final == "s":
@@ -222,18 +316,19 @@ class TerminalEmulator:
     def _apply_sgr(self, params: List[int]) -> None:
         if not params:
             params = [0]
+        n = len(params)
         i = 0
-        while i < len(params):
+        while i < n:
             p = params[i]
             if p == 0:
-                self.current_fg = (230, 230, 230)
-                self.current_bg = (10, 12, 16)
-                self.bold = False
+                self.current_fg = DEFAULT_FG
+                self.current_bg = DEFAULT_BG
+                self.current_bold = False
                 self.inverse = False
             elif p == 1:
-                self.bold = True
+                self.current_bold = True
             elif p in (2, 21, 22):
-                self.bold = False
+                self.current_bold = False
             elif p == 7:
                 self.inverse = True
             elif p == 27:
@@ -243,16 +338,16 @@ class TerminalEmulator:
             elif 90 <= p <= 97:
                 self.current_fg = BASE_COLORS[p - 90 + 8]
             elif p == 39:
-                self.current_fg = (230, 230, 230)
+                self.current_fg = DEFAULT_FG
             elif 40 <= p <= 47:
                 self.current_bg = BASE_COLORS[p - 40]
             elif 100 <= p <= 107:
                 self.current_bg = BASE_COLORS[p - 100 + 8]
             elif p == 49:
-                self.current_bg = (10, 12, 16)
+                self.current_bg = DEFAULT_BG
             elif p in (38, 48):
                 is_fg = p == 38
-                if i + 1 < len(params) and params[i + 1] == 2 and i + 4 < len(params):
+                if i + 1 < n and params[i + 1] == 2 and i + 4 < n:
                     r, g, b = params[i + 2 : i + 5]
                     color = (r, g, b)
                     if is_fg:
@@ -260,9 +355,8 @@ class TerminalEmulator:
                     else:
                         self.current_bg = color
                     i += 4
-                elif i + 1 < len(params) and params[i + 1] == 5 and i + 2 < len(params):
-                    idx = params[i + 2]
-                    color = color_from_index(idx)
+                elif i + 1 < n and params[i + 1] == 5 and i + 2 < n:
+                    color = color_from_index(params[i + 2])
                     if is_fg:
                         self.current_fg = color
                     else:
@@ -272,41 +366,68 @@ class TerminalEmulator:
 
 
 def fill_rect(screen: TerminalEmulator, x: int, y: int, w: int, h: int, ch: str, fg: Tuple[int, int, int], bg: Tuple[int, int, int], bold: bool = False) -> None:
-    for yy in range(y, min(screen.rows, y + h)):
-        for xx in range(x, min(screen.cols, x + w)):
-            screen.cells[yy][xx] = Cell(ch=ch, fg=fg, bg=bg, bold=bold)
+    if w <= 0 or h <= 0 or x >= screen.cols or y >= screen.rows or x + w <= 0 or y + h <= 0:
+        return
+    screen.fill_block(max(0, y), min(screen.rows, y + h), max(0, x), min(screen.cols, x + w), ch, fg, bg, bold)
 
 
 def draw_text(screen: TerminalEmulator, x: int, y: int, text: str, fg: Tuple[int, int, int], bg: Optional[Tuple[int, int, int]] = None, bold: bool = False) -> None:
-    if not (0 <= y < screen.rows):
+    if not (0 <= y < screen.rows) or x >= screen.cols or x + len(text) <= 0:
         return
-    for i, ch in enumerate(text):
-        xx = x + i
-        if 0 <= xx < screen.cols:
-            cell_bg = bg if bg is not None else screen.cells[y][xx].bg
-            screen.cells[y][xx] = Cell(ch=ch, fg=fg, bg=cell_bg, bold=bold)
+    skip = max(0, -x)
+    start, end = x + skip, min(screen.cols, x + len(text))
+    n = end - start
+    screen.ch[y][start:end] = text[skip : skip + n]
+    screen.fg[y][start:end] = [fg] * n
+    if bg is not None:
+        screen.bg[y][start:end] = [bg] * n
+    screen.bold[y][start:end] = (b"\x01" if bold else b"\x00") * n
 
 
 def draw_box(screen: TerminalEmulator, x: int, y: int, w: int, h: int, fg: Tuple[int, int, int], bg: Tuple[int, int, int], title: Optional[str] = None) -> None:
-    if w <= 1 or h <= 1:
+    # Past the right or bottom edge nothing, title included, can be visible.
+    # A box clipped away to the left or top still gets its title drawn, as
+    # the title may overhang the border.
+    if w <= 1 or h <= 1 or x >= screen.cols or y >= screen.rows:
         return
-    fill_rect(screen, x, y, w, h, " ", fg, bg)
-    for xx in range(x, min(screen.cols, x + w)):
-        for yy in (y, min(screen.rows - 1, y + h - 1)):
-            screen.cells[yy][xx] = Cell(ch="-" if yy in (y, y + h - 1) else " ", fg=fg, bg=bg, bold=False)
-    for yy in range(y, min(screen.rows, y + h)):
-        for xx in (x, min(screen.cols - 1, x + w - 1)):
-            screen.cells[yy][xx] = Cell(ch="|" if xx in (x, x + w - 1) else " ", fg=fg, bg=bg, bold=False)
-    screen.cells[y][x] = Cell(ch="+", fg=fg, bg=bg, bold=False)
-    screen.cells[y][min(screen.cols - 1, x + w - 1)] = Cell(ch="+", fg=fg, bg=bg, bold=False)
-    screen.cells[min(screen.rows - 1, y + h - 1)][x] = Cell(ch="+", fg=fg, bg=bg, bold=False)
-    screen.cells[min(screen.rows - 1, y + h - 1)][min(screen.cols - 1, x + w - 1)] = Cell(ch="+", fg=fg, bg=bg, bold=False)
+    left, top = max(0, x), max(0, y)
+    right = min(screen.cols - 1, x + w - 1)
+    bottom = min(screen.rows - 1, y + h - 1)
+    if right >= left and bottom >= top:
+        # fill_rect already paints the border colors, so only glyphs are
+        # left. Sides cut off by the screen edge are not drawn; the right and
+        # bottom corners still land on the clamped last column/row.
+        fill_rect(screen, x, y, w, h, " ", fg, bg)
+        edge = ["-"] * (right + 1 - left)
+        if y >= 0:
+            screen.ch[y][left : right + 1] = edge
+        if bottom == y + h - 1:
+            screen.ch[bottom][left : right + 1] = edge
+        for row in screen.ch[top : bottom + 1]:
+            if x >= 0:
+                row[x] = "|"
+            if right == x + w - 1:
+                row[right] = "|"
+        for yy in (y, bottom) if y >= 0 else (bottom,):
+            row = screen.ch[yy]
+            if x >= 0:
+                row[x] = "+"
+            row[right] = "+"
     if title:
         draw_text(screen, x + 2, y, f"[ {title} ]", fg, bg, bold=True)
 
 
-def make_mock_system_monitor(rows: int, cols: int) -> TerminalEmulator:
-    screen = TerminalEmulator(cols, rows)
+def mock_screen(rows: int, cols: int, screen: Optional[TerminalEmulator]) -> TerminalEmulator:
+    # Builders can share one scratch emulator; it is reset rather than
+    # reallocated as long as the requested size matches.
+    if screen is None or (screen.rows, screen.cols) != (rows, cols):
+        return TerminalEmulator(cols, rows)
+    screen.reset()
+    return screen
+
+
+def make_mock_system_monitor(rows: int, cols: int, screen: Optional[TerminalEmulator] = None) -> TerminalEmulator:
+    screen = mock_screen(rows, cols, screen)
     bg = (12, 14, 22)
     surface = (20, 26, 38)
     accent = (98, 148, 255)
@@ -350,8 +471,8 @@ def make_mock_system_monitor(rows: int, cols: int) -> TerminalEmulator:
     return screen
 
 
-def make_mock_file_manager(rows: int, cols: int) -> TerminalEmulator:
-    screen = TerminalEmulator(cols, rows)
+def make_mock_file_manager(rows: int, cols: int, screen: Optional[TerminalEmulator] = None) -> TerminalEmulator:
+    screen = mock_screen(rows, cols, screen)
     bg = (10, 12, 18)
     surface = (22, 24, 32)
     accent = (116, 207, 136)
@@ -402,8 +523,8 @@ def make_mock_file_manager(rows: int, cols: int) -> TerminalEmulator:
     return screen
 
 
-def make_mock_showcase(rows: int, cols: int) -> TerminalEmulator:
-    screen = TerminalEmulator(cols, rows)
+def make_mock_showcase(rows: int, cols: int, screen: Optional[TerminalEmulator] = None) -> TerminalEmulator:
+    screen = mock_screen(rows, cols, screen)
     bg = (14, 14, 24)
     surface = (24, 26, 36)
     accent = (239, 155, 87)
@@ -447,11 +568,29 @@ def make_mock_showcase(rows: int, cols: int) -> TerminalEmulator:
     return screen
 
 
+CAPTURE_BUFFER_SIZE = 1 << 20
+CAPTURE_READ_SIZE = 1 << 16
+PROC_POLL_INTERVAL = 0.1
+SVG_WRITE_BUFFER = 1 << 20
+
+
 def set_winsize(fd: int, rows: int, cols: int) -> None:
     fcntl_payload = struct.pack("HHHH", rows, cols, 0, 0)
     fcntl.ioctl(fd, termios.TIOCSWINSZ, fcntl_payload)
 
 
+def read_into(fd: int, buffer: bytearray, used: int) -> int:
+    # Reads land directly in the spare capacity of a preallocated buffer,
+    # which doubles only when less than one read's worth of room is left.
+    if len(buffer) - used < CAPTURE_READ_SIZE:
+        buffer.extend(bytes(len(buffer)))
+    view = memoryview(buffer)[used:]
+    try:
+        return os.readv(fd, [view])
+    finally:
+        view.release()
+
+
 def run_capture(cmd: List[str], rows: int, cols: int, duration: float) -> bytes:
     master_fd, slave_fd = pty.openpty()
     set_winsize(master_fd, rows, cols)
@@ -468,83 +607,129 @@ def run_capture(cmd: List[str], rows: int, cols: int, duration: float) -> bytes:
     )
     os.close(slave_fd)
 
-    buffer = bytearray()
-    end_time = time.time() + duration
+    buffer = bytearray(CAPTURE_BUFFER_SIZE)
+    used = 0
+    selector = selectors.DefaultSelector()
+    selector.register(master_fd, selectors.EVENT_READ)
+    deadline = time.monotonic() + duration
+    next_poll = 0.0
     try:
-        while time.time() < end_time and proc.poll() is None:
-            r, _, _ = select.select([master_fd], [], [], 0.05)
-            if master_fd in r:
-                chunk = os.read(master_fd, 4096)
-                if not chunk:
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            # Reap checks are throttled; the selector wakes us for output.
+            if now >= next_poll:
+                if proc.poll() is not None:
                     break
-                buffer.extend(chunk)
+                next_poll = now + PROC_POLL_INTERVAL
+            if not selector.select(timeout=min(deadline, next_poll) - now):
+                continue
+            try:
+                got = read_into(master_fd, buffer, used)
+            except OSError:
+                break
+            if not got:
+                break
+            used += got
     finally:
+        selector.close()
         if proc.poll() is None:
             os.killpg(proc.pid, signal.SIGTERM)
             time.sleep(0.1)
         try:
             while True:
-                chunk = os.read(master_fd, 4096)
-                if not chunk:
+                got = read_into(master_fd, buffer, used)
+                if not got:
                     break
-                buffer.extend(chunk)
+                used += got
         except OSError:
             pass
         os.close(master_fd)
-    return bytes(buffer)
+    return bytes(memoryview(buffer)[:used])
+
+
+@functools.lru_cache(maxsize=4096)
+def rgb_hex(color: Tuple[int, int, int]) -> bytes:
+    return b"#%02x%02x%02x" % color
 
 
-def rgb_hex(color: Tuple[int, int, int]) -> str:
-    return "#{:02x}{:02x}{:02x}".format(*color)
+def runs(row: Iterable[T]) -> Iterator[Tuple[int, int, T]]:
+    # groupby compares neighbours in C; only run boundaries reach Python.
+    start = 0
+    for value, group in groupby(row):
+        end = start + len(tuple(group))
+        yield start, end, value
+        start = end
 
 
-def render_svg(screen: TerminalEmulator, cell_w: int = 9, cell_h: int = 16, padding: int = 10) -> str:
+def style_runs(fg_row: List[Color], bold_row: bytearray) -> Iterator[Tuple[int, int, Color, int]]:
+    # Runs compare color tuples with ==; shared references make most compares
+    # short-circuit per element. A run is only split further where its bold
+    # flags differ.
+    for start, end, fg in runs(fg_row):
+        bold = bold_row[start:end]
+        if bold.count(bold[0]) == end - start:
+            yield start, end, fg, bold[0]
+        else:
+            for sub_start, sub_end, flag in runs(bold):
+                yield start + sub_start, start + sub_end, fg, flag
+
+
+def render_svg(screen: TerminalEmulator, out: BinaryIO, cell_w: int = 9, cell_h: int = 16, padding: int = 10) -> None:
     width = padding * 2 + screen.cols * cell_w
     height = padding * 2 + screen.rows * cell_h
-    bg0 = screen.cells[0][0].bg if screen.cells else (0, 0, 0)
-    lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
-        f'  <rect x="0" y="0" width="{width}" height="{height}" fill="{rgb_hex(bg0)}" rx="8" ry="8"/>',
-    ]
-
-    # Draw background spans for non-default backgrounds.
-    for y, row in enumerate(screen.cells):
-        x = 0
-        while x < screen.cols:
-            start = x
-            bg = row[x].bg
-            while x < screen.cols and row[x].bg == bg:
-                x += 1
+    bg0 = screen.bg[0][0] if screen.rows and screen.cols else (0, 0, 0)
+    # Lines are formatted as bytes and written straight to ``out`` as they are
+    # produced, so the whole document is never held in memory.
+    write = out.write
+    write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+    write(b'<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" viewBox="0 0 %d %d">\n' % (width, height, width, height))
+    write(b'  <rect x="0" y="0" width="%d" height="%d" fill="%b" rx="8" ry="8"/>\n' % (width, height, rgb_hex(bg0)))
+
+    # Draw background spans for non-default backgrounds, one <path> per color
+    # with a closed subpath for each span.
+    spans_by_color: Dict[Color, List[bytes]] = {}
+    for y, row in enumerate(screen.bg):
+        rect_y = padding + y * cell_h
+        for start, end, bg in runs(row):
             if bg != bg0:
-                rect_x = padding + start * cell_w
-                rect_w = (x - start) * cell_w
-                rect_y = padding + y * cell_h
-                lines.append(
-                    f'  <rect x="{rect_x}" y="{rect_y}" width="{rect_w}" height="{cell_h}" fill="{rgb_hex(bg)}"/>'
+                rect_w = (end - start) * cell_w
+                spans_by_color.setdefault(bg, []).append(
+                    b"M%d %dh%dv%dh-%dz" % (padding + start * cell_w, rect_y, rect_w, cell_h, rect_w)
                 )
-
-    font = "monospace"
-    for y, row in enumerate(screen.cells):
-        text_y = padding + y * cell_h
-        for x, cell in enumerate(row):
-            ch = cell.ch if cell.ch != "\x00" else " "
-            if ch == " ":
+    for bg, spans in spans_by_color.items():
+        write(b'  <path fill="%b" d="%b"/>\n' % (rgb_hex(bg), b"".join(spans)))
+
+    # One <text> per row and one <tspan> per run of matching (fg, bold); the
+    # per-glyph x list keeps every character pinned to its grid column.
+    font = b"monospace"
+    glyph_x = [b"%d" % (padding + x * cell_w) for x in range(screen.cols)]
+    for y in range(screen.rows):
+        line = "".join(screen.ch[y]).replace("\x00", " ")
+        spans = []
+        for start, end, fg, bold in style_runs(screen.fg[y], screen.bold[y]):
+            text = line[start:end]
+            body = text.lstrip(" ")
+            start += len(text) - len(body)
+            body = body.rstrip(" ")
+            if not body:
                 continue
-            attrs = [
-                f'x="{padding + x * cell_w}"',
-                f'y="{text_y}"',
-                'xml:space="preserve"',
-                f'font-family="{font}"',
-                'font-size="13"',
-                'dominant-baseline="hanging"',
-                f'fill="{rgb_hex(cell.fg)}"',
-            ]
-            if cell.bold:
-                attrs.append('font-weight="700"')
-            lines.append(f'  <text {" ".join(attrs)}>{html.escape(ch)}</text>')
-    lines.append("</svg>")
-    return "\n".join(lines) + "\n"
+            spans.append(
+                b'<tspan x="%b" fill="%b"%b>%b</tspan>'
+                % (
+                    b" ".join(glyph_x[start : start + len(body)]),
+                    rgb_hex(fg),
+                    b' font-weight="700"' if bold else b"",
+                    html.escape(body).encode("utf-8"),
+                )
+            )
+        if spans:
+            write(
+                b'  <text y="%d" xml:space="preserve" font-family="%b" font-size="13" dominant-baseline="hanging">%b</text>\n'
+                % (padding + y * cell_h, font, b"".join(spans))
+            )
+    write(b"</svg>\n")
 
 
 def polished_svg(title: str, subtitle: str, accent: str, body: List[str]) -> str:
@@ -742,7 +927,8 @@ def data_to_svg(
     screen = TerminalEmulator(cols, rows)
     screen.feed(data)
     out_path = out_dir / f"{name}.svg"
-    out_path.write_text(render_svg(screen, cell_w=cell_w, cell_h=cell_h, padding=padding), encoding="utf-8")
+    with out_path.open("wb", buffering=SVG_WRITE_BUFFER) as out:
+        render_svg(screen, out, cell_w=cell_w, cell_h=cell_h, padding=padding)
     return out_path
 
 
@@ -788,7 +974,13 @@ def main() -> None:
         for name, builder in POLISHED_MOCKS.items():
             print(f"[mock] {name}: drawing polished README visual")
             out_path = out_dir / f"{name}.svg"
-            out_path.write_text(builder(), encoding="utf-8")
+            svg = builder().encode("utf-8")
+            # Mocks are deterministic; leave an identical file (and its mtime)
+            # alone so reruns do not churn the assets directory.
+            if out_path.exists() and out_path.read_bytes() == svg:
+                print(f"[mock] {out_path} is up to date")
+                continue
+            out_path.write_bytes(svg)
             print(f"[mock] wrote {out_path}")
     elif args.from_raw:
         raw_files = sorted(args.raw_dir.glob("*.ansi"))
@@ -55,8 +55,8 @@ def locate_text(screen: TerminalEmulator, needle: str) -> tuple[int, int]:
     if not needle:
         raise RuntimeError("empty text locator")
 
-    for y, row in enumerate(screen.cells):
-        line = "".join(cell.ch for cell in row)
+    for y, row in enumerate(screen.ch):
+        line = "".join(row)
         x = line.find(needle)
         if x >= 0:
             return x, y
@@ -129,7 +129,7 @@ def ansi_visible_lines(capture: bytes, cols: int, rows: int) -> list[str]:
 
     screen = TerminalEmulator(cols, rows)
     screen.feed(capture)
-    return ["".join(cell.ch for cell in row) for row in screen.cells]
+    return ["".join(row) for row in screen.ch]
 
 
 def validate_ansi_capture_quality(capture: bytes, text_capture: bytes, target: str) -> None:
@@ -328,34 +328,35 @@ def render_terminal_panel(
 
     origin_x = x + 8
     origin_y = y + 8 + cell_h
-    for row_index, row in enumerate(screen.cells):
+    for row_index, row_bg in enumerate(screen.bg):
         yy = origin_y + row_index * cell_h
         col = 0
         while col < screen.cols:
             start = col
-            bg = row[col].bg
-            while col < screen.cols and row[col].bg == bg:
+            bg = row_bg[col]
+            while col < screen.cols and row_bg[col] == bg:
                 col += 1
             draw.rectangle(
                 (origin_x + start * cell_w, yy, origin_x + col * cell_w, yy + cell_h),
                 fill=bg,
             )
 
-        for col_index, cell in enumerate(row):
-            if cell.ch == " ":
+        row_fg, row_bold = screen.fg[row_index], screen.bold[row_index]
+        for col_index, ch in enumerate(screen.ch[row_index]):
+            if ch == " ":
                 continue
             draw.text(
                 (origin_x + col_index * cell_w, yy),
-                cell.ch,
+                ch,
                 font=font,
-                fill=cell.fg,
+                fill=row_fg[col_index],
             )
-            if cell.bold:
+            if row_bold[col_index]:
                 draw.text(
                     (origin_x + col_index * cell_w + 1, yy),
-                    cell.ch,
+                    ch,
                     font=font,
-                    fill=cell.fg,
+                    fill=row_fg[col_index],
                 )
 
 